@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+
+#
+# libseccomp "introduced in kernel version" validation script
+#
+# Copyright (c) 2025 Cisco Systems, Inc. <pmoore2@cisco.com>
+#
+
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of version 2.1 of the GNU Lesser General Public License as
+# published by the Free Software Foundation.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses>.
+#
+
+""" Validate the *_kver columns in syscalls.csv against the kernel sources
+
+This tool walks the syscalls.csv file and, for every architecture that has
+a validator defined below, checks the "introduced in kernel version" (KV_*)
+value recorded in the CSV against the kernel's git history.  The kernel
+commit that added a syscall to the architecture's syscall table is located
+via git blame, and the oldest release tag containing that commit is taken
+as the version that introduced the syscall.
+"""
+
+import argparse
+import csv
+import io
+import re
+import subprocess
+import sys
+
+# map of kernel release tags to the KV_* enum names used in syscalls.csv,
+# ordered from oldest to newest release
+KERNEL_DICT = {
+    'v3.0': 'KV_3_0',
+    'v3.1': 'KV_3_1',
+    'v3.2': 'KV_3_2',
+    'v3.3': 'KV_3_3',
+    'v3.4': 'KV_3_4',
+    'v3.5': 'KV_3_5',
+    'v3.6': 'KV_3_6',
+    'v3.7': 'KV_3_7',
+    'v3.8': 'KV_3_8',
+    'v3.9': 'KV_3_9',
+    'v3.10': 'KV_3_10',
+    'v3.11': 'KV_3_11',
+    'v3.12': 'KV_3_12',
+    'v3.13': 'KV_3_13',
+    'v3.14': 'KV_3_14',
+    'v3.15': 'KV_3_15',
+    'v3.16': 'KV_3_16',
+    'v3.17': 'KV_3_17',
+    'v3.18': 'KV_3_18',
+    'v3.19': 'KV_3_19',
+    'v4.0': 'KV_4_0',
+    'v4.1': 'KV_4_1',
+    'v4.2': 'KV_4_2',
+    'v4.3': 'KV_4_3',
+    'v4.4': 'KV_4_4',
+    'v4.5': 'KV_4_5',
+    'v4.6': 'KV_4_6',
+    'v4.7': 'KV_4_7',
+    'v4.8': 'KV_4_8',
+    'v4.9': 'KV_4_9',
+    'v4.10': 'KV_4_10',
+    'v4.11': 'KV_4_11',
+    'v4.12': 'KV_4_12',
+    'v4.13': 'KV_4_13',
+    'v4.14': 'KV_4_14',
+    'v4.15': 'KV_4_15',
+    'v4.16': 'KV_4_16',
+    'v4.17': 'KV_4_17',
+    'v4.18': 'KV_4_18',
+    'v4.19': 'KV_4_19',
+    'v4.20': 'KV_4_20',
+    'v5.0': 'KV_5_0',
+    'v5.1': 'KV_5_1',
+    'v5.2': 'KV_5_2',
+    'v5.3': 'KV_5_3',
+    'v5.4': 'KV_5_4',
+    'v5.5': 'KV_5_5',
+    'v5.6': 'KV_5_6',
+    'v5.7': 'KV_5_7',
+    'v5.8': 'KV_5_8',
+    'v5.9': 'KV_5_9',
+    'v5.10': 'KV_5_10',
+    'v5.11': 'KV_5_11',
+    'v5.12': 'KV_5_12',
+    'v5.13': 'KV_5_13',
+    'v5.14': 'KV_5_14',
+    'v5.15': 'KV_5_15',
+    'v5.16': 'KV_5_16',
+    'v5.17': 'KV_5_17',
+    'v5.18': 'KV_5_18',
+    'v5.19': 'KV_5_19',
+    'v6.0': 'KV_6_0',
+    'v6.1': 'KV_6_1',
+    'v6.2': 'KV_6_2',
+}
+
+
+def run(args, cwd=None):
+    """ Run a command
+
+    Arguments:
+    args - the command and its arguments as a list
+    cwd - the directory to run the command in
+
+    Description:
+    Execute the given command, without an intermediate shell, and return
+    its stripped stdout, raising an OSError if the command fails.  The
+    stdlib subprocess.run() helper spawns list-form commands through
+    posix_spawn() where available, which is cheaper than a plain fork
+    of the interpreter.
+    """
+    proc = subprocess.run(args, cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise OSError('command failed (%d): %s' %
+                      (proc.returncode, ' '.join(args)))
+    return proc.stdout.strip()
+
+
+def run_stream(args, cwd=None):
+    """ Run a command and stream its output
+
+    Arguments:
+    args - the command and its arguments as a list
+    cwd - the directory to run the command in
+
+    Description:
+    Execute the given command and yield its stdout one line at a time
+    as it is produced, rather than buffering the full output in memory
+    first; this lets the caller parse while the command is still
+    running and keeps the peak memory use at a single line.
+    """
+    proc = subprocess.Popen(args, cwd=cwd, shell=False,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL)
+    with io.TextIOWrapper(proc.stdout, encoding='UTF-8') as stdout:
+        for line in stdout:
+            yield line
+    if proc.wait() != 0:
+        raise OSError('command failed (%d): %s' %
+                      (proc.returncode, ' '.join(args)))
+
+
+class Arch(object):
+    """ Base class for the per-architecture validators
+    """
+
+    # path of the syscall table file, relative to the kernel sources
+    syscall_file = None
+
+    # a git blame --line-porcelain hunk header, i.e.
+    # "<commit hash> <original line> <final line> [<lines in hunk>]"
+    _blame_regex = re.compile(r'^([0-9a-f]{40}) \d+ (\d+)')
+
+    def __init__(self):
+        self.kernel_path = None
+        # map of syscall name -> line number in the syscall table file
+        self.syscall_dict = {}
+        # map of line number -> commit hash, built from the blame output
+        self.blame_by_line = {}
+        # map of commit hash -> oldest release tag containing the commit
+        self._tag_map = None
+
+    def build_syscall_dict(self):
+        """ Build the syscall name -> line number dictionary
+
+        Description:
+        Parse the architecture's syscall table file in the kernel sources
+        and record the line number of each syscall definition so the git
+        blame output can be matched to it later.
+        """
+        raise NotImplementedError
+
+    def run_git_blame(self):
+        """ Run git blame on the architecture's syscall table file
+
+        Description:
+        Run git blame once and index its output by line number so that
+        the individual syscall lookups are simple dictionary accesses
+        rather than rescans of the full blame output.  The
+        --line-porcelain format is used as it is unambiguous to parse
+        (the hunk headers can not be confused with line content, commit
+        summaries or file paths) and cheaper for git to produce than the
+        human-readable format.  The output is streamed and parsed as it
+        arrives instead of buffered whole.
+        """
+        for line in run_stream(['git', 'blame', '--line-porcelain',
+                                self.syscall_file], cwd=self.kernel_path):
+            match = self._blame_regex.match(line)
+            if match:
+                self.blame_by_line[int(match.group(2))] = match.group(1)
+
+    def get_commit_hash(self, syscall_name):
+        """ Find the commit that added a syscall to the syscall table
+
+        Arguments:
+        syscall_name - the syscall name
+
+        Description:
+        Return the abbreviated hash of the commit that last touched the
+        syscall's line in the syscall table file.
+        """
+        return self.blame_by_line[self.syscall_dict[syscall_name]]
+
+    def _build_tag_map(self):
+        """ Build the commit hash -> oldest release tag map
+
+        Description:
+        Walk the release tags from oldest to newest and list the commits
+        that each release adds on top of the previous one; the first
+        release to list a commit is the oldest release containing it.
+        This costs one git invocation per release instead of one "git
+        tag --contains" (a full tag-graph traversal) per syscall.
+        """
+        self._tag_map = {}
+        prev_tag = None
+        for tag in KERNEL_DICT:
+            args = ['git', 'rev-list', tag]
+            if prev_tag is not None:
+                args.append('^' + prev_tag)
+            for commit_hash in run(args, cwd=self.kernel_path).split():
+                self._tag_map.setdefault(commit_hash, tag)
+            prev_tag = tag
+
+    def find_oldest_tag(self, commit_hash):
+        """ Find the oldest kernel release tag containing a commit
+
+        Arguments:
+        commit_hash - the commit hash
+
+        Description:
+        Return the oldest "vX.Y" release tag that contains the given
+        commit, skipping all of the -rcN tags.
+        """
+        if self._tag_map is None:
+            self._build_tag_map()
+        try:
+            return self._tag_map[commit_hash]
+        except KeyError:
+            raise LookupError('no release tag contains commit %s' %
+                              commit_hash)
+
+    def get_commit_tag(self, syscall_name):
+        """ Find the kernel release tag that introduced a syscall
+
+        Arguments:
+        syscall_name - the syscall name
+        """
+        return self.find_oldest_tag(self.get_commit_hash(syscall_name))
+
+    def validate(self, syscall_name, syscall_num, introduced_version):
+        """ Validate a single syscalls.csv entry
+
+        Arguments:
+        syscall_name - the syscall name
+        syscall_num - the syscall number from the CSV, or "PNR"
+        introduced_version - the KV_* value from the CSV
+
+        Description:
+        Check the CSV's "introduced in kernel version" value against the
+        kernel's git history, returning None if the entry can not be
+        checked, True if it matches, and False otherwise.
+        """
+        if syscall_num == 'PNR':
+            return None
+        if not self.blame_by_line:
+            self.build_syscall_dict()
+            self.run_git_blame()
+        if syscall_name not in self.syscall_dict:
+            return None
+        try:
+            tag = self.get_commit_tag(syscall_name)
+        except LookupError:
+            # the syscall's line was last touched by a commit newer than
+            # every release in KERNEL_DICT, e.g. because the kernel
+            # checkout is at master rather than a release tag; there is
+            # no release to compare against
+            return None
+        return KERNEL_DICT[tag] == introduced_version
+
+
+class Arch_x86_64(Arch):
+    """ x86_64 syscall table validator
+    """
+
+    syscall_file = 'arch/x86/entry/syscalls/syscall_64.tbl'
+
+    def build_syscall_dict(self):
+        tbl_path = '{}/{}'.format(self.kernel_path, self.syscall_file)
+        with open(tbl_path) as fh:
+            for line_num, line in enumerate(fh, 1):
+                if line.startswith('#') or not line.strip():
+                    continue
+                parts = line.split()
+                # skip the x32 ABI syscalls
+                if parts[1] == 'x32':
+                    continue
+                self.syscall_dict.setdefault(parts[2], line_num)
+
+
+# one entry per architecture column in syscalls.csv; architectures without
+# a validator are skipped.  The list holds the validator classes, not
+# instances - the instances are created lazily by _get_validator() so
+# that importing the module (or running it with e.g. --help) does not
+# pay for any validator setup
+validators = [
+    None,             # x86
+    Arch_x86_64,      # x86_64
+    None,             # x32
+    None,             # arm
+    None,             # aarch64
+    None,             # loongarch64
+    None,             # m68k
+    None,             # mips
+    None,             # mips64
+    None,             # mips64n32
+    None,             # parisc
+    None,             # parisc64
+    None,             # ppc
+    None,             # ppc64
+    None,             # riscv64
+    None,             # s390
+    None,             # s390x
+    None,             # sh
+]
+
+
+def _get_validator(idx):
+    """ Return the validator for an architecture, instantiating it on demand
+
+    Arguments:
+    idx - the architecture's index in the validators list
+
+    Description:
+    Replace the validator class stored in the validators list with an
+    instance of it the first time the architecture is looked up, and
+    return the instance on this and every later lookup.
+    """
+    validator = validators[idx]
+    if isinstance(validator, type):
+        validator = validators[idx] = validator()
+    return validator
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='libseccomp "introduced in kernel version" validator')
+    parser.add_argument('-k', '--kernel', required=True,
+                        help='path to the kernel sources')
+    parser.add_argument('-c', '--csv', default='syscalls.csv',
+                        help='path to the syscalls.csv file')
+    args = parser.parse_args()
+
+    # resolve the column offsets of the architectures that actually have
+    # a validator so the row loop does not test the others at all; the
+    # validators are only instantiated here, once the kernel path is
+    # known, and get it assigned before any git work can run
+    active_validators = [(idx * 2 + 1, _get_validator(idx))
+                         for idx, validator in enumerate(validators)
+                         if validator is not None]
+    for col_idx, validator in active_validators:
+        validator.kernel_path = args.kernel
+
+    failures = 0
+    # a 1MiB read buffer pulls the whole CSV in with a couple of reads
+    # instead of the default buffer's many small ones
+    with open(args.csv, 'r', buffering=1 << 20) as csv_file:
+        reader = csv.reader(csv_file, skipinitialspace=True)
+        # skip the header
+        next(reader)
+        for row in reader:
+            syscall_name = row[0]
+            for col_idx, validator in active_validators:
+                result = validator.validate(syscall_name,
+                                            row[col_idx],
+                                            row[col_idx + 1])
+                if result is False:
+                    print('mismatch: %s (%s)' %
+                          (syscall_name, row[col_idx + 1]))
+                    failures += 1
+
+    if failures:
+        print('%d mismatches found' % failures)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+
+#
+# libseccomp "introduced in kernel version" population script
+#
+# Copyright (c) 2025 Cisco Systems, Inc. <pmoore2@cisco.com>
+#
+
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of version 2.1 of the GNU Lesser General Public License as
+# published by the Free Software Foundation.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses>.
+#
+
+""" Populate the *_kver columns in syscalls.csv from the kernel sources
+
+This tool walks the kernel release tags from oldest to newest and parses
+the architecture syscall table at each release; the first release whose
+table contains a syscall is recorded as the version that introduced it.
+The syscalls.csv file is then rewritten with the "introduced in kernel
+version" (KV_*) columns filled in for every architecture that has a
+populator defined below.
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import os
+import subprocess
+import sys
+
+# directory holding the cached per-release scan results
+CACHE_DIR = '.cache'
+
+# map of kernel release tags to the KV_* enum names used in syscalls.csv,
+# ordered from oldest to newest release
+KERNEL_DICT = {
+    'v3.0': 'KV_3_0',
+    'v3.1': 'KV_3_1',
+    'v3.2': 'KV_3_2',
+    'v3.3': 'KV_3_3',
+    'v3.4': 'KV_3_4',
+    'v3.5': 'KV_3_5',
+    'v3.6': 'KV_3_6',
+    'v3.7': 'KV_3_7',
+    'v3.8': 'KV_3_8',
+    'v3.9': 'KV_3_9',
+    'v3.10': 'KV_3_10',
+    'v3.11': 'KV_3_11',
+    'v3.12': 'KV_3_12',
+    'v3.13': 'KV_3_13',
+    'v3.14': 'KV_3_14',
+    'v3.15': 'KV_3_15',
+    'v3.16': 'KV_3_16',
+    'v3.17': 'KV_3_17',
+    'v3.18': 'KV_3_18',
+    'v3.19': 'KV_3_19',
+    'v4.0': 'KV_4_0',
+    'v4.1': 'KV_4_1',
+    'v4.2': 'KV_4_2',
+    'v4.3': 'KV_4_3',
+    'v4.4': 'KV_4_4',
+    'v4.5': 'KV_4_5',
+    'v4.6': 'KV_4_6',
+    'v4.7': 'KV_4_7',
+    'v4.8': 'KV_4_8',
+    'v4.9': 'KV_4_9',
+    'v4.10': 'KV_4_10',
+    'v4.11': 'KV_4_11',
+    'v4.12': 'KV_4_12',
+    'v4.13': 'KV_4_13',
+    'v4.14': 'KV_4_14',
+    'v4.15': 'KV_4_15',
+    'v4.16': 'KV_4_16',
+    'v4.17': 'KV_4_17',
+    'v4.18': 'KV_4_18',
+    'v4.19': 'KV_4_19',
+    'v4.20': 'KV_4_20',
+    'v5.0': 'KV_5_0',
+    'v5.1': 'KV_5_1',
+    'v5.2': 'KV_5_2',
+    'v5.3': 'KV_5_3',
+    'v5.4': 'KV_5_4',
+    'v5.5': 'KV_5_5',
+    'v5.6': 'KV_5_6',
+    'v5.7': 'KV_5_7',
+    'v5.8': 'KV_5_8',
+    'v5.9': 'KV_5_9',
+    'v5.10': 'KV_5_10',
+    'v5.11': 'KV_5_11',
+    'v5.12': 'KV_5_12',
+    'v5.13': 'KV_5_13',
+    'v5.14': 'KV_5_14',
+    'v5.15': 'KV_5_15',
+    'v5.16': 'KV_5_16',
+    'v5.17': 'KV_5_17',
+    'v5.18': 'KV_5_18',
+    'v5.19': 'KV_5_19',
+    'v6.0': 'KV_6_0',
+    'v6.1': 'KV_6_1',
+    'v6.2': 'KV_6_2',
+}
+
+
+def run(args, cwd=None):
+    """ Run a command
+
+    Arguments:
+    args - the command and its arguments as a list
+    cwd - the directory to run the command in
+
+    Description:
+    Execute the given command, without an intermediate shell, and return
+    its stripped stdout, raising an OSError if the command fails.  The
+    stdlib subprocess.run() helper spawns list-form commands through
+    posix_spawn() where available, which is cheaper than a plain fork
+    of the interpreter.
+    """
+    proc = subprocess.run(args, cwd=cwd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise OSError('command failed (%d): %s' %
+                      (proc.returncode, ' '.join(args)))
+    return proc.stdout.strip()
+
+
+class Arch(object):
+    """ Base class for the per-architecture populators
+    """
+
+    # candidate paths of the syscall table file, relative to the kernel
+    # sources; the file moved over the kernel's history so the first path
+    # that exists at a given release wins
+    syscall_files = []
+
+    def __init__(self):
+        # map of syscall name -> KV_* enum name of the introducing release
+        self.syscall_dict = {}
+
+    def parse_table_data(self, table_data):
+        """ List the syscalls defined by a syscall table file
+
+        Arguments:
+        table_data - the contents of the syscall table file
+
+        Description:
+        Parse the given syscall table contents and return the names of
+        the syscalls it defines.
+        """
+        raise NotImplementedError
+
+    def resolve_table_blob(self, kernel_path, kernel_version):
+        """ Resolve the blob hash of a release's syscall table file
+
+        Arguments:
+        kernel_path - path to the kernel sources
+        kernel_version - the kernel release tag, e.g. "v5.4"
+
+        Description:
+        Return the git blob hash of the architecture's syscall table
+        file in the given release, or None if the release does not have
+        the file.  The blob hash of a tagged release never changes, so
+        it can key a cache of parsed table contents.
+        """
+        for syscall_file in self.syscall_files:
+            try:
+                return run(['git', 'rev-parse', '--verify', '-q',
+                            '{}:{}'.format(kernel_version, syscall_file)],
+                           cwd=kernel_path)
+            except OSError:
+                continue
+        return None
+
+    def build_syscall_dict(self, kernel_version, syscall_names):
+        """ Record the syscalls present in a given kernel release
+
+        Arguments:
+        kernel_version - the kernel release tag, e.g. "v5.4"
+        syscall_names - the syscall names present in the release
+
+        Description:
+        Record, for every syscall not seen in an earlier release, the
+        release's KV_* enum name; the releases must be fed to this
+        method from oldest to newest.
+        """
+        for syscall_name in syscall_names:
+            self.syscall_dict.setdefault(syscall_name,
+                                         KERNEL_DICT[kernel_version])
+
+    def introduced_version(self, syscall_name):
+        """ Return the KV_* enum name for a syscall
+
+        Arguments:
+        syscall_name - the syscall name
+        """
+        try:
+            return self.syscall_dict[syscall_name]
+        except KeyError:
+            return 'KV_UNDEF'
+
+
+class Arch_x86_64(Arch):
+    """ x86_64 syscall table populator
+    """
+
+    syscall_files = [
+        'arch/x86/entry/syscalls/syscall_64.tbl',   # v4.2 and later
+        'arch/x86/syscalls/syscall_64.tbl',         # v3.3 through v4.1
+    ]
+
+    def parse_table_data(self, table_data):
+        syscall_names = []
+        for line in table_data.split('\n'):
+            if line.startswith('#') or not line.strip():
+                continue
+            parts = line.split()
+            # skip the x32 ABI syscalls
+            if parts[1] == 'x32':
+                continue
+            syscall_names.append(parts[2])
+        return syscall_names
+
+
+# one entry per architecture column in syscalls.csv; architectures without
+# a populator are left untouched.  The list holds the populator classes,
+# not instances - the instances are created lazily by _get_populator() so
+# that importing the module (or running it with e.g. --help) does not pay
+# for any populator setup
+populators = [
+    None,             # x86
+    Arch_x86_64,      # x86_64
+    None,             # x32
+    None,             # arm
+    None,             # aarch64
+    None,             # loongarch64
+    None,             # m68k
+    None,             # mips
+    None,             # mips64
+    None,             # mips64n32
+    None,             # parisc
+    None,             # parisc64
+    None,             # ppc
+    None,             # ppc64
+    None,             # riscv64
+    None,             # s390
+    None,             # s390x
+    None,             # sh
+]
+
+
+def _get_populator(idx):
+    """ Return the populator for an architecture, instantiating it on demand
+
+    Arguments:
+    idx - the architecture's index in the populators list
+
+    Description:
+    Replace the populator class stored in the populators list with an
+    instance of it the first time the architecture is looked up, and
+    return the instance on this and every later lookup.
+    """
+    populator = populators[idx]
+    if isinstance(populator, type):
+        populator = populators[idx] = populator()
+    return populator
+
+
+def _cache_read(blob_sha):
+    """ Read a cached syscall name list
+
+    Arguments:
+    blob_sha - the blob hash of the syscall table file
+
+    Description:
+    Return the cached syscall name list for the given syscall table
+    blob, or None on a cache miss.
+    """
+    cache_file = os.path.join(CACHE_DIR, 'syscalls-{}.json'.format(blob_sha))
+    try:
+        with open(cache_file, 'r') as cache:
+            return json.load(cache)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_write(blob_sha, syscall_names):
+    """ Write a syscall name list to the cache
+
+    Arguments:
+    blob_sha - the blob hash of the syscall table file
+    syscall_names - the syscall names parsed from the blob
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache_file = os.path.join(CACHE_DIR, 'syscalls-{}.json'.format(blob_sha))
+    with open(cache_file, 'w') as cache:
+        json.dump(syscall_names, cache)
+
+
+# the kernel source path used by the worker processes
+_worker_kernel_path = None
+
+
+def _kernel_path_init(kernel_path):
+    """ Record the kernel source path in a worker process
+
+    Arguments:
+    kernel_path - path to the kernel sources
+    """
+    global _worker_kernel_path
+    _worker_kernel_path = kernel_path
+
+
+def _scan_blob(blob_item):
+    """ Parse a single syscall table blob
+
+    Arguments:
+    blob_item - a (blob hash, populator index) tuple
+
+    Description:
+    Read the syscall table blob straight from the git object store and
+    return the syscall names it defines; no working tree is involved.
+    """
+    blob_sha, idx = blob_item
+    table_data = run(['git', 'cat-file', 'blob', blob_sha],
+                     cwd=_worker_kernel_path)
+    return _get_populator(idx).parse_table_data(table_data)
+
+
+def parse_syscalls_csv_header(header_line, kernel_path):
+    """ Parse the syscalls.csv header and build the syscall dictionaries
+
+    Arguments:
+    header_line - the first line of syscalls.csv
+    kernel_path - path to the kernel sources
+
+    Description:
+    Verify the syscalls.csv column layout and then scan every kernel
+    release's syscall tables.  Parsed tables are cached on disk keyed
+    by the table file's git blob hash - release tags are immutable, so
+    a cached entry never goes stale and repeat runs skip the scan
+    entirely.  Table blobs missing from the cache are read straight
+    from the git object store and parsed in parallel across a pool of
+    worker processes - releases that share an unchanged table resolve
+    to the same blob and are only parsed once, and no working tree is
+    checked out at any point.  The results are merged in release order
+    afterwards so that the oldest release still wins.
+    """
+    columns = header_line.strip().split(',')
+    if (len(columns) - 1) != (len(populators) * 2):
+        raise ValueError('unexpected number of columns in the CSV header')
+
+    # resolve the blob hash of every (release, architecture) syscall
+    # table and pull what we can from the cache
+    blob_shas = {}
+    names_by_sha = {}
+    for kernel_version in KERNEL_DICT.keys():
+        for idx, populator in enumerate(populators):
+            if populator is None:
+                continue
+            blob_sha = _get_populator(idx).resolve_table_blob(kernel_path,
+                                                              kernel_version)
+            blob_shas[(kernel_version, idx)] = blob_sha
+            if blob_sha is not None and blob_sha not in names_by_sha:
+                syscall_names = _cache_read(blob_sha)
+                if syscall_names is not None:
+                    names_by_sha[blob_sha] = syscall_names
+
+    # map of blob hash -> populator index for the blobs that still need
+    # to be parsed
+    missing = {}
+    for (kernel_version, idx), blob_sha in blob_shas.items():
+        if blob_sha is not None and blob_sha not in names_by_sha:
+            missing.setdefault(blob_sha, idx)
+
+    if missing:
+        worker_cnt = min(os.cpu_count() or 1, len(missing))
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=worker_cnt,
+                initializer=_kernel_path_init,
+                initargs=(kernel_path,)) as pool:
+            results = list(pool.map(_scan_blob, missing.items()))
+        for (blob_sha, idx), syscall_names in zip(missing.items(), results):
+            names_by_sha[blob_sha] = syscall_names
+            _cache_write(blob_sha, syscall_names)
+
+    for kernel_version in KERNEL_DICT.keys():
+        for idx, populator in enumerate(populators):
+            if populator is None:
+                continue
+            blob_sha = blob_shas[(kernel_version, idx)]
+            if blob_sha is None:
+                continue
+            _get_populator(idx).build_syscall_dict(kernel_version,
+                                                   names_by_sha[blob_sha])
+
+
+def parse_syscalls_csv_data(csv_file):
+    """ Rewrite the syscalls.csv data lines with the KV_* columns filled in
+
+    Arguments:
+    csv_file - the open syscalls.csv file, positioned at the first data line
+
+    Description:
+    Walk the CSV data lines and replace each architecture's *_kver column
+    with the populator's "introduced in kernel version" value, returning
+    the updated CSV text.
+    """
+    updated_lines = []
+    append_line = updated_lines.append
+    reader = csv.reader(csv_file, skipinitialspace=True)
+    # pair each syscall number column offset with its populator once
+    # instead of re-deriving the populator index on every cell
+    pair_populators = None
+    for row in reader:
+        syscall_name = row[0]
+        cells = [syscall_name]
+        append_cell = cells.append
+        if pair_populators is None:
+            pair_populators = [
+                (idx * 2 + 1,
+                 None if populator is None else _get_populator(idx))
+                for idx, populator in enumerate(populators)]
+        for col_idx, populator in pair_populators:
+            syscall_num = row[col_idx]
+            introduced_version = row[col_idx + 1]
+            if populator is not None and syscall_num != 'PNR':
+                introduced_version = populator.introduced_version(syscall_name)
+            append_cell(syscall_num)
+            append_cell(introduced_version)
+        append_line(','.join(cells) + '\n')
+    return ''.join(updated_lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='libseccomp "introduced in kernel version" populator')
+    parser.add_argument('-k', '--kernel', required=True,
+                        help='path to the kernel sources')
+    parser.add_argument('-c', '--csv', default='syscalls.csv',
+                        help='path to the syscalls.csv file')
+    args = parser.parse_args()
+
+    # fail up front on a bad kernel path; resolve_table_blob() treats a
+    # git failure as "this release does not have the table file", so
+    # without this check a typo'd kernel path would quietly rewrite
+    # every populated *_kver cell back to KV_UNDEF
+    try:
+        run(['git', 'rev-parse', '--git-dir'], cwd=args.kernel)
+    except OSError:
+        print('error: %s is not a git repository' % args.kernel)
+        return 1
+
+    # a 1MiB read buffer pulls the whole CSV in with a couple of reads
+    # instead of the default buffer's many small ones
+    with open(args.csv, 'r', buffering=1 << 20) as csv_file:
+        header_line = csv_file.readline()
+        parse_syscalls_csv_header(header_line, args.kernel)
+        updated_syscalls_csv = header_line + parse_syscalls_csv_data(csv_file)
+
+    with open(args.csv, 'w') as csv_file:
+        csv_file.write(updated_syscalls_csv)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+
+#
+# libseccomp syscall range table generation script
+#
+# Copyright (c) 2025 Cisco Systems, Inc. <pmoore2@cisco.com>
+#
+
+#
+# This library is free software; you can redistribute it and/or modify it
+# under the terms of version 2.1 of the GNU Lesser General Public License as
+# published by the Free Software Foundation.
+#
+# This library is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this library; if not, see <http://www.gnu.org/licenses>.
+#
+
+""" Generate the per kernel version syscall number range tables
+
+This tool reads syscalls.csv and, for every architecture whose *_kver
+columns have been populated, computes the ranges of syscall numbers that
+are valid at each kernel version.  The ranges are written out as C tables
+in a generated header file; architectures whose "introduced in kernel
+version" data is not populated yet get NULL table entries.
+"""
+
+import argparse
+import csv
+import hashlib
+import heapq
+import os
+import shutil
+import sys
+
+# default name of the generated header file
+C_HEADER_FILE = 'kver-ranges.h'
+
+# directory holding the cached generated headers
+CACHE_DIR = '.cache'
+
+# map of the KV_* enum names used in syscalls.csv to their numeric values,
+# ordered from oldest to newest release; KV_UNDEF marks a syscall with no
+# known introducing kernel version
+KERNEL_DICT = {
+    'KV_UNDEF': -1,
+    'KV_3_0': 0,
+    'KV_3_1': 1,
+    'KV_3_2': 2,
+    'KV_3_3': 3,
+    'KV_3_4': 4,
+    'KV_3_5': 5,
+    'KV_3_6': 6,
+    'KV_3_7': 7,
+    'KV_3_8': 8,
+    'KV_3_9': 9,
+    'KV_3_10': 10,
+    'KV_3_11': 11,
+    'KV_3_12': 12,
+    'KV_3_13': 13,
+    'KV_3_14': 14,
+    'KV_3_15': 15,
+    'KV_3_16': 16,
+    'KV_3_17': 17,
+    'KV_3_18': 18,
+    'KV_3_19': 19,
+    'KV_4_0': 20,
+    'KV_4_1': 21,
+    'KV_4_2': 22,
+    'KV_4_3': 23,
+    'KV_4_4': 24,
+    'KV_4_5': 25,
+    'KV_4_6': 26,
+    'KV_4_7': 27,
+    'KV_4_8': 28,
+    'KV_4_9': 29,
+    'KV_4_10': 30,
+    'KV_4_11': 31,
+    'KV_4_12': 32,
+    'KV_4_13': 33,
+    'KV_4_14': 34,
+    'KV_4_15': 35,
+    'KV_4_16': 36,
+    'KV_4_17': 37,
+    'KV_4_18': 38,
+    'KV_4_19': 39,
+    'KV_4_20': 40,
+    'KV_5_0': 41,
+    'KV_5_1': 42,
+    'KV_5_2': 43,
+    'KV_5_3': 44,
+    'KV_5_4': 45,
+    'KV_5_5': 46,
+    'KV_5_6': 47,
+    'KV_5_7': 48,
+    'KV_5_8': 49,
+    'KV_5_9': 50,
+    'KV_5_10': 51,
+    'KV_5_11': 52,
+    'KV_5_12': 53,
+    'KV_5_13': 54,
+    'KV_5_14': 55,
+    'KV_5_15': 56,
+    'KV_5_16': 57,
+    'KV_5_17': 58,
+    'KV_5_18': 59,
+    'KV_5_19': 60,
+    'KV_6_0': 61,
+    'KV_6_1': 62,
+    'KV_6_2': 63,
+}
+
+# intern the keys so the per-cell lookups in the parse loop can resolve
+# with a pointer compare instead of a full string comparison whenever the
+# probed cell value is itself interned
+KERNEL_DICT = {sys.intern(key): value for key, value in KERNEL_DICT.items()}
+
+# the kernel version keys in release order with the non-release markers
+# filtered out, so the hot loops iterate a plain tuple instead of
+# re-testing every key against the markers
+KERNEL_KEYS = tuple(key for key, value in KERNEL_DICT.items() if value >= 0)
+KERNEL_KEYS_COUNT = len(KERNEL_KEYS)
+
+
+class Arch(object):
+    """ Per-architecture syscall table data
+    """
+
+    def __init__(self, name):
+        self.name = name
+        # cleared when the architecture's *_kver data is not populated
+        self.valid = True
+        # per CSV row: the syscall number as an int, or -1 when the
+        # syscall is not implemented ("PNR")
+        self.syscall_nums = []
+        # per CSV row: the KERNEL_DICT value of the *_kver column
+        self.introduced_version = []
+        # map of KV_* enum name -> list of [first, last] syscall ranges
+        self.ranges = {}
+
+
+class Settings(object):
+    """ Data shared across the parse and generation stages
+    """
+
+    def __init__(self):
+        self.kernel_version = None
+        self.arch = []
+        # per CSV column: the Arch object the column belongs to and
+        # whether it is a syscall number ('num') or *_kver ('kv') column
+        self.col_arch = []
+        self.col_kind = []
+
+
+def parse_syscalls_header(columns, settings):
+    """ Parse the syscalls.csv header row
+
+    Arguments:
+    columns - the header row cells
+    settings - the Settings object to fill in
+
+    Description:
+    Extract the kernel version the CSV was generated against and create
+    an Arch object for every architecture column pair, recording per
+    column which Arch it belongs to and what kind of column it is so
+    the data parser can index straight into those maps.
+    """
+    # the first column is "#syscall (vX.Y.Z YYYY-MM-DD)"
+    settings.kernel_version = columns[0].split('(')[1].split()[0]
+    settings.col_arch.append(None)
+    settings.col_kind.append(None)
+    for idx in range(1, len(columns), 2):
+        arch_name = columns[idx]
+        kver_name = columns[idx + 1]
+        if kver_name != arch_name + '_kver':
+            raise ValueError('unexpected column pair: %s, %s' %
+                             (arch_name, kver_name))
+        arch = Arch(arch_name)
+        settings.arch.append(arch)
+        settings.col_arch.extend((arch, arch))
+        settings.col_kind.extend(('num', 'kv'))
+
+
+def parse_syscalls_data(columns, settings):
+    """ Parse a syscalls.csv data row
+
+    Arguments:
+    columns - the data row cells
+    settings - the Settings object to fill in
+
+    Description:
+    Record each architecture's syscall number and "introduced in kernel
+    version" value for the row's syscall.  An architecture that has an
+    implemented syscall without a known introducing kernel version has
+    not been populated yet and is marked invalid; once that happens the
+    architecture's remaining cells are skipped outright, since
+    build_ranges() discards its data anyway.
+    """
+    # bind the loop invariants to locals, this runs once per cell of
+    # every row in the CSV
+    kd_get = KERNEL_DICT.__getitem__
+    col_arch = settings.col_arch
+    col_kind = settings.col_kind
+    for idx in range(1, len(columns)):
+        arch = col_arch[idx]
+        if not arch.valid:
+            continue
+        col = columns[idx]
+        if col_kind[idx] == 'num':
+            # convert the syscall number once at parse time; "PNR" and
+            # any other non-numeric marker becomes -1
+            arch.syscall_nums.append(
+                int(col) if col.lstrip('-').isdigit() else -1)
+        else:
+            kernel_enum = kd_get(col)
+            if kernel_enum < 0 and columns[idx - 1] != 'PNR':
+                arch.valid = False
+            arch.introduced_version.append(kernel_enum)
+
+
+def convert_list_to_ranges(sorted_syscall_nums):
+    """ Convert a sorted list of syscall numbers into ranges
+
+    Arguments:
+    sorted_syscall_nums - the sorted list of syscall numbers
+
+    Description:
+    Collapse the given list into a list of (first, last) tuples covering
+    exactly the given numbers, in a single pass; a consecutive number
+    extends the current range, anything else flushes it and starts a new
+    one.  Tracking the current range in two locals avoids both the "is
+    this the first element" test and the indexed update of the last
+    range on every iteration.
+    """
+    ranges = []
+    num_iter = iter(sorted_syscall_nums)
+    try:
+        cur_first = cur_last = next(num_iter)
+    except StopIteration:
+        return ranges
+    for syscall_num in num_iter:
+        if syscall_num == cur_last + 1:
+            cur_last = syscall_num
+        else:
+            ranges.append((cur_first, cur_last))
+            cur_first = cur_last = syscall_num
+    ranges.append((cur_first, cur_last))
+    return ranges
+
+
+def build_ranges(arch, kernel_dict=KERNEL_DICT, kernel_keys=KERNEL_KEYS):
+    """ Build an architecture's per kernel version syscall ranges
+
+    Arguments:
+    arch - the Arch object
+    kernel_dict - map of KV_* enum names to their numeric values
+    kernel_keys - the kernel version keys, ordered oldest to newest
+
+    Description:
+    For every kernel version, collect the syscall numbers introduced at
+    or before that version and collapse them into ranges.  The syscalls
+    are sorted once by (introduced version, syscall number) and the
+    kernel versions are walked from oldest to newest, each one merging
+    its own (already sorted) batch of numbers into the previous
+    version's number set in linear time, instead of re-filtering and
+    re-sorting the full syscall list for every version.  The kernel
+    version map is a parameter so the same parsed CSV data can be turned
+    into range tables for a different set of versions without re-parsing.
+    """
+    if not arch.valid:
+        return
+    pairs = []
+    for idx, syscall_num in enumerate(arch.syscall_nums):
+        if syscall_num < 0:
+            continue
+        version = arch.introduced_version[idx]
+        if version < 0:
+            continue
+        pairs.append((version, syscall_num))
+    pairs.sort()
+
+    # the syscall numbers valid at the kernel version being processed
+    active = []
+    pair_idx = 0
+    pair_cnt = len(pairs)
+    # the collapsed ranges of the active set, shared between every
+    # kernel version whose syscall set is identical
+    snapshot = None
+    # NOTE: this relies on kernel_keys being ordered oldest to newest
+    for key in kernel_keys:
+        kernel_enum = kernel_dict[key]
+        batch_idx = pair_idx
+        while pair_idx < pair_cnt and pairs[pair_idx][0] <= kernel_enum:
+            pair_idx += 1
+        if pair_idx > batch_idx:
+            # the kernel versions are consecutive, so this batch holds a
+            # single introduced version and is therefore already sorted
+            # by syscall number; merge the two sorted lists in linear
+            # time instead of insort-ing one number at a time
+            batch = [pair[1] for pair in pairs[batch_idx:pair_idx]]
+            active = list(heapq.merge(active, batch))
+            snapshot = convert_list_to_ranges(active)
+        if snapshot:
+            # most releases add no syscalls, so their entries all point
+            # at the same snapshot; the ranges are never mutated after
+            # this, which makes the sharing safe
+            arch.ranges[key] = snapshot
+
+
+def build_tables(settings):
+    """ Build the C range and size table initializers
+
+    Arguments:
+    settings - the Settings object
+
+    Description:
+    Return the text of the two dimensional [architecture][kernel version]
+    C table initializers pointing at the per-architecture range arrays,
+    with NULL/0 entries for the architectures without range data.  The
+    rows are collected in lists and joined once at the end; repeated
+    string += would copy the full accumulated text on every append, and
+    joining the cells also does away with trimming a trailing comma.
+    """
+    ranges_rows = []
+    sizes_rows = []
+    for arch in settings.arch:
+        ranges_cells = []
+        sizes_cells = []
+        for key in KERNEL_KEYS:
+            # most architectures have no range data yet, so test with
+            # get() rather than paying for a KeyError on nearly every
+            # iteration
+            ranges = arch.ranges.get(key)
+            if ranges is None:
+                ranges_cells.append('NULL')
+                sizes_cells.append('0')
+            else:
+                ranges_cells.append('ranges_{}_{}'.format(arch.name, key))
+                sizes_cells.append(str(len(ranges)))
+        ranges_rows.append('\t{' + ','.join(ranges_cells) + '},\n')
+        sizes_rows.append('\t{' + ','.join(sizes_cells) + '},\n')
+    return ''.join(ranges_rows), ''.join(sizes_rows)
+
+
+def print_range(arch, key):
+    """ Format one per kernel version range array
+
+    Arguments:
+    arch - the Arch object
+    key - the KV_* enum name
+
+    Description:
+    Return the C array initializer text for the given architecture and
+    kernel version as a single string, built with one join instead of
+    one file write per range, along with a RANGES_*_COUNT macro holding
+    the array length.  The ranges are emitted in ascending,
+    non-overlapping order so that consumers can binary search the array
+    by syscall number.
+    """
+    ranges = arch.ranges[key]
+    # consumers are told they can binary search the arrays, so fail
+    # loudly if the generator ever stops producing sorted and disjoint
+    # ranges
+    assert all(prev[1] < cur[0] for prev, cur in zip(ranges, ranges[1:]))
+    body = '\n'.join('\t{{{}, {}}},'.format(rng[0], rng[1])
+                     for rng in ranges)
+    return '#define RANGES_{}_{}_COUNT {}\n' \
+           'static const struct kver_range ranges_{}_{}[] = {{\n' \
+           '{}\n}};\n\n'.format(arch.name.upper(), key, len(ranges),
+                                arch.name, key, body)
+
+
+def print_arch_ranges(arch):
+    """ Format an architecture's range arrays
+
+    Arguments:
+    arch - the Arch object
+
+    Description:
+    Return the C array initializer texts for the architecture, one
+    string per kernel version that has range data.
+    """
+    return [print_range(arch, key)
+            for key in KERNEL_KEYS if key in arch.ranges]
+
+
+def print_header_file(header_path, settings):
+    """ Print the generated C header file
+
+    Arguments:
+    header_path - path of the header file to write
+    settings - the Settings object
+
+    Description:
+    Assemble the complete header text in memory and hand it to the file
+    in a single write call, through a generously sized output buffer,
+    instead of issuing one small write per piece of boilerplate.
+    """
+    ranges_tbl, sizes_tbl = build_tables(settings)
+    chunks = []
+    chunks.append('/* automatically generated by arch-syscall-ranges.py '
+                  'from syscalls.csv ({}) - do not edit */\n\n'.format(
+                      settings.kernel_version))
+    chunks.append('#ifndef _KVER_RANGES_H\n'
+                  '#define _KVER_RANGES_H\n\n'
+                  '#include <stddef.h>\n\n'
+                  'struct kver_range {\n'
+                  '\tint first;\n'
+                  '\tint last;\n'
+                  '};\n\n'
+                  '/* the range arrays below are sorted by .first and do '
+                  'not overlap, so they\n'
+                  ' * can be binary searched by syscall number */\n\n')
+    for arch in settings.arch:
+        chunks.extend(print_arch_ranges(arch))
+    chunks.append('static const struct kver_range *const '
+                  'range_table[][{}] = {{\n'.format(KERNEL_KEYS_COUNT))
+    chunks.append(ranges_tbl)
+    chunks.append('};\n\n')
+    chunks.append('static const size_t '
+                  'sizes_table[][{}] = {{\n'.format(KERNEL_KEYS_COUNT))
+    chunks.append(sizes_tbl)
+    chunks.append('};\n\n')
+    chunks.append('#endif\n')
+    with open(header_path, 'w', buffering=1 << 20) as hf:
+        hf.write(''.join(chunks))
+
+
+def _cache_key(csv_path):
+    """ Compute the cache key for a generated header
+
+    Arguments:
+    csv_path - path to the syscalls.csv file
+
+    Description:
+    Return a digest over the CSV contents and this script's own source;
+    the generated header depends on nothing else, so an unchanged key
+    guarantees an identical header and hashing the script itself makes
+    the cache invalidate on script changes without a version constant to
+    keep bumped.
+    """
+    digest = hashlib.blake2b()
+    with open(csv_path, 'rb') as csv_file:
+        digest.update(csv_file.read())
+    with open(__file__, 'rb') as script_file:
+        digest.update(script_file.read())
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='libseccomp syscall range table generator')
+    parser.add_argument('-c', '--csv', default='syscalls.csv',
+                        help='path to the syscalls.csv file')
+    parser.add_argument('-o', '--output', default=C_HEADER_FILE,
+                        help='path of the generated header file')
+    args = parser.parse_args()
+
+    # skip the full parse and build when an identical header was already
+    # generated from the same inputs
+    cache_file = os.path.join(CACHE_DIR,
+                              'kver-ranges-{}.h'.format(_cache_key(args.csv)))
+    if os.path.exists(cache_file):
+        shutil.copyfile(cache_file, args.output)
+        return 0
+
+    settings = Settings()
+    # a 1MiB read buffer pulls the whole CSV in with a couple of reads
+    # instead of the default buffer's many small ones
+    with open(args.csv, 'r', buffering=1 << 20) as csv_file:
+        # the csv module tokenizes and strips the cells in C, instead of
+        # a Python-level split()/strip() per cell
+        reader = csv.reader(csv_file, skipinitialspace=True)
+        for idx, row in enumerate(reader):
+            if idx == 0:
+                parse_syscalls_header(row, settings)
+            else:
+                parse_syscalls_data(row, settings)
+
+    for arch in settings.arch:
+        build_ranges(arch)
+
+    print_header_file(args.output, settings)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    shutil.copyfile(args.output, cache_file)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
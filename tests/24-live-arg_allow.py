@@ -38,15 +38,12 @@ def test():
     fd = os.open("/dev/null", os.O_WRONLY|os.O_CREAT)
 
     f = SyscallFilter(TRAP)
-    # NOTE: additional syscalls required for python
     f.add_rule(ALLOW, "write", Arg(0, EQ, fd))
-    f.add_rule(ALLOW, "close")
-    f.add_rule(ALLOW, "munmap")
-    f.add_rule(ALLOW, "rt_sigaction")
-    f.add_rule(ALLOW, "rt_sigreturn")
-    f.add_rule(ALLOW, "sigaltstack")
-    f.add_rule(ALLOW, "exit_group")
-    f.add_rule(ALLOW, "brk")
+    # NOTE: additional syscalls required for python
+    add_rule = f.add_rule
+    for syscall in ("close", "munmap", "rt_sigaction", "rt_sigreturn",
+                    "sigaltstack", "exit_group", "brk"):
+        add_rule(ALLOW, syscall)
     f.load()
 
     try: